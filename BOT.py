@@ -1,12 +1,19 @@
 import os
 import re
+import asyncio
 import logging
 import datetime
+import time
+import random
+import zlib
+from bisect import bisect_left, bisect_right
 import requests
-from typing import Dict, Any, List
+from collections import deque
+from typing import Dict, Any, List, Optional
 import json
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, Message, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.helpers import escape_markdown
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -31,6 +38,20 @@ OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 PRIMARY_MODEL = "google/gemini-2.5-pro-free"
 BACKUP_MODEL = "meta-llama/llama-4-maverick-free"
 
+# Upstream resilience
+OPENROUTER_DEADLINE_SECONDS = 40  # Total time a user waits, across all attempts
+OPENROUTER_MAX_ATTEMPTS = 3
+OPENROUTER_MIN_TIMEOUT = 5
+OPENROUTER_MAX_TIMEOUT = 30
+LATENCY_EWMA_ALPHA = 0.125
+LATENCY_DEVIATION_BETA = 0.25
+RETRY_BUDGET_RATIO = 0.2  # Retries earned per original request
+RETRY_BUDGET_MAX_TOKENS = 10
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 4
+RESULT_CACHE_SIZE = 50  # Recent results kept per user and content type
+DEGRADED_MIN_SIMILARITY = 0.2
+
 # Paystack Configuration
 PAYSTACK_INIT_URL = "https://api.paystack.co/transaction/initialize"
 CALLBACK_URL = "https://t.me/YourBotUsername"  # Update with your bot username
@@ -58,9 +79,39 @@ CONTENT_TYPES = {
     '🎨 Generate Image': 'image'
 }
 
+TYPE_EMOJI = {
+    'social_post': '📱',
+    'ad_copy': '📢',
+    'product_desc': '📦',
+    'hashtags': '#️⃣',
+    'image': '🎨'
+}
+
+# Generation history
+HISTORY_PAGE_SIZE = 5
+HISTORY_PREVIEW_LENGTH = 40
+HISTORY_UNCOMPRESSED_ENTRIES = 20  # Most recent entries kept uncompressed per user
+HISTORY_COMPRESS_BLOCK = 50  # Aged-out entries compressed together into one blob
+
 # ========== STATE MANAGEMENT ==========
 user_data: Dict[int, Dict[str, Any]] = {}
 
+# Observed OpenRouter latency per model: smoothed average and deviation (seconds)
+model_latency: Dict[str, Dict[str, float]] = {}
+
+# Shared retry budget so brownouts don't multiply upstream load
+retry_budget: Dict[str, float] = {'tokens': RETRY_BUDGET_MAX_TOKENS}
+
+# Recent successful results per (user_id, content type), served when upstream is down
+result_cache: Dict[tuple, deque] = {}
+
+# Per-user generation history. Entry ids are list positions, so they are
+# ordered by creation time; history_index maps content type -> sorted ids.
+generation_history: Dict[int, List[Dict[str, Any]]] = {}
+history_index: Dict[int, Dict[str, List[int]]] = {}
+# Compressed prompts/results of aged-out entries: user_id -> block number -> blob
+history_blocks: Dict[int, Dict[int, bytes]] = {}
+
 # ========== LOGGING ==========
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -123,8 +174,62 @@ def is_valid_email(email: str) -> bool:
     return re.match(pattern, email) is not None
 
 
-def call_openrouter(prompt: str, system_prompt: str = None) -> str:
-    """Call OpenRouter API with fallback."""
+def adaptive_timeout(model: str) -> float:
+    """Derive a request timeout from observed latency for a model."""
+    stats = model_latency.get(model)
+    if not stats:
+        return OPENROUTER_MAX_TIMEOUT
+    
+    timeout = stats['avg'] + 4 * stats['dev']
+    return max(OPENROUTER_MIN_TIMEOUT, min(timeout, OPENROUTER_MAX_TIMEOUT))
+
+
+def record_latency(model: str, elapsed: float) -> None:
+    """Fold an observed response time into the model's latency estimate."""
+    stats = model_latency.get(model)
+    
+    if not stats:
+        model_latency[model] = {'avg': elapsed, 'dev': elapsed / 2}
+        return
+    
+    stats['dev'] += LATENCY_DEVIATION_BETA * (abs(elapsed - stats['avg']) - stats['dev'])
+    stats['avg'] += LATENCY_EWMA_ALPHA * (elapsed - stats['avg'])
+
+
+def deposit_retry_token() -> None:
+    """Earn a fraction of a retry for every original request."""
+    retry_budget['tokens'] = min(
+        RETRY_BUDGET_MAX_TOKENS, retry_budget['tokens'] + RETRY_BUDGET_RATIO
+    )
+
+
+def withdraw_retry_token() -> bool:
+    """Spend one retry from the shared budget. Returns False if exhausted."""
+    if retry_budget['tokens'] < 1:
+        return False
+    retry_budget['tokens'] -= 1
+    return True
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt."""
+    cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+async def call_openrouter(prompt: str, system_prompt: str = None, deadline: Optional[float] = None) -> str:
+    """Call OpenRouter API with fallback.
+    
+    Attempts alternate between the primary and backup model. Each attempt's
+    timeout comes from observed latency and is capped by the time left until
+    `deadline` (a time.monotonic() value). Timeouts, connection errors, 429
+    and 5xx responses are transient: the next attempt draws from a shared
+    retry budget with jittered backoff, so an upstream brownout fails fast
+    instead of piling on more load. Any other failure rules that model out
+    and falls back to the other one without spending the budget. The
+    blocking HTTP call runs in a worker thread so other users' updates keep
+    flowing while this one waits.
+    """
     messages = []
     
     if system_prompt:
@@ -134,39 +239,193 @@ def call_openrouter(prompt: str, system_prompt: str = None) -> str:
     
     models = [PRIMARY_MODEL, BACKUP_MODEL]
     
-    for model in models:
+    if deadline is None:
+        deadline = time.monotonic() + OPENROUTER_DEADLINE_SECONDS
+    
+    deposit_retry_token()
+    
+    tried = set()
+    free_fallback = False  # Last failure ruled its model out; moving on is not a retry
+    
+    for attempt in range(OPENROUTER_MAX_ATTEMPTS):
+        if not models:
+            break
+        
+        model = models[attempt % len(models)]
+        
+        if attempt > 0 and not (free_fallback and model not in tried):
+            if not withdraw_retry_token():
+                logger.warning("OpenRouter retry budget exhausted, giving up")
+                return None
+            delay = backoff_delay(attempt)
+            if deadline - time.monotonic() - delay < OPENROUTER_MIN_TIMEOUT:
+                logger.warning("OpenRouter deadline too close to retry, giving up")
+                return None
+            await asyncio.sleep(delay)
+        
+        free_fallback = False
+        tried.add(model)
+        
+        remaining = deadline - time.monotonic()
+        if remaining < OPENROUTER_MIN_TIMEOUT:
+            logger.warning("OpenRouter deadline exceeded, giving up")
+            return None
+        
+        timeout = min(adaptive_timeout(model), remaining)
+        started = time.monotonic()
+        
         try:
-            response = requests.post(
-                OPENROUTER_URL,
-                headers={
-                    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": messages
-                },
-                timeout=30
+            # requests' timeout only bounds each socket read, so cap the whole call
+            response = await asyncio.wait_for(
+                asyncio.to_thread(
+                    requests.post,
+                    OPENROUTER_URL,
+                    headers={
+                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "model": model,
+                        "messages": messages
+                    },
+                    timeout=timeout
+                ),
+                timeout
             )
             
             response.raise_for_status()
             result = response.json()
+            record_latency(model, time.monotonic() - started)
             return result['choices'][0]['message']['content']
             
+        except (requests.exceptions.Timeout, asyncio.TimeoutError):
+            record_latency(model, time.monotonic() - started)
+            logger.error(f"Timeout with model {model} after {timeout:.1f}s")
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Connection error with model {model}: {e}")
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code
+            logger.error(f"HTTP {status_code} from model {model}: {e}")
+            if status_code != 429 and status_code < 500:
+                # Bad request, unknown model or credit problems won't fix themselves
+                models.remove(model)
+                free_fallback = True
         except Exception as e:
+            # Malformed body, e.g. a 200 carrying a provider error instead of choices
             logger.error(f"Error with model {model}: {e}")
-            if model == models[-1]:  # Last model failed
-                return None
-            continue
+            models.remove(model)
+            free_fallback = True
     
     return None
 
 
+def _tokenize(text: str) -> set:
+    """Lowercase word set used for prompt similarity."""
+    return set(re.findall(r'\w+', text.lower()))
+
+
+def remember_result(user_id: int, content_type: str, prompt: str, result: str) -> None:
+    """Keep a user's generated result for degraded mode."""
+    cache = result_cache.setdefault((user_id, content_type), deque(maxlen=RESULT_CACHE_SIZE))
+    cache.append((_tokenize(prompt), prompt, result))
+
+
+def find_similar_result(user_id: int, content_type: str, prompt: str) -> Optional[tuple]:
+    """Find the user's most similar cached result for a content type.
+    
+    Returns (prompt, result) or None if nothing is similar enough.
+    """
+    tokens = _tokenize(prompt)
+    best, best_score = None, DEGRADED_MIN_SIMILARITY
+    
+    for cached_tokens, cached_prompt, cached_result in result_cache.get((user_id, content_type), ()):
+        union = tokens | cached_tokens
+        if not union:
+            continue
+        score = len(tokens & cached_tokens) / len(union)
+        if score >= best_score:
+            best, best_score = (cached_prompt, cached_result), score
+    
+    return best
+
+
+def add_history_entry(user_id: int, content_type: str, prompt: str, result: str) -> None:
+    """Store a generation and compress entries that have aged out of the recent window."""
+    entries = generation_history.setdefault(user_id, [])
+    entry_id = len(entries)
+    
+    preview = prompt if len(prompt) <= HISTORY_PREVIEW_LENGTH else prompt[:HISTORY_PREVIEW_LENGTH - 1] + '…'
+    entries.append({
+        'id': entry_id,
+        'created_at': datetime.datetime.now(),
+        'content_type': content_type,
+        'preview': preview,
+        'prompt': prompt,
+        'result': result
+    })
+    history_index.setdefault(user_id, {}).setdefault(content_type, []).append(entry_id)
+    
+    # Compress a whole block at a time; single short entries barely shrink
+    aged = len(entries) - HISTORY_UNCOMPRESSED_ENTRIES
+    if aged > 0 and aged % HISTORY_COMPRESS_BLOCK == 0:
+        block = aged // HISTORY_COMPRESS_BLOCK - 1
+        start = block * HISTORY_COMPRESS_BLOCK
+        payload = [
+            [old.pop('prompt'), old.pop('result')]
+            for old in entries[start:start + HISTORY_COMPRESS_BLOCK]
+        ]
+        history_blocks.setdefault(user_id, {})[block] = zlib.compress(json.dumps(payload).encode('utf-8'))
+
+
+def get_history_entry(user_id: int, entry_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch a history entry with its prompt and result decompressed."""
+    entries = generation_history.get(user_id, [])
+    
+    if not 0 <= entry_id < len(entries):
+        return None
+    
+    entry = dict(entries[entry_id])
+    if 'prompt' not in entry:
+        block, offset = divmod(entry_id, HISTORY_COMPRESS_BLOCK)
+        payload = json.loads(zlib.decompress(history_blocks[user_id][block]).decode('utf-8'))
+        entry['prompt'], entry['result'] = payload[offset]
+    return entry
+
+
+def get_history_page(user_id: int, content_type: str = 'all', direction: str = 'o',
+                     cursor: Optional[int] = None) -> tuple[List[Dict[str, Any]], bool, bool]:
+    """Return one page of history, newest first, using keyset pagination.
+    
+    `direction` 'o' returns entries older than `cursor` (or the newest page when
+    cursor is None); 'n' returns entries newer than `cursor`. Lookups bisect the
+    id index, so page cost does not grow with history size.
+    Returns (entries, has_newer, has_older).
+    """
+    entries = generation_history.get(user_id, [])
+    
+    if content_type == 'all':
+        ids = range(len(entries))
+    else:
+        ids = history_index.get(user_id, {}).get(content_type, [])
+    
+    if direction == 'n':
+        lo = bisect_right(ids, cursor)
+        hi = min(lo + HISTORY_PAGE_SIZE, len(ids))
+    else:
+        hi = len(ids) if cursor is None else bisect_left(ids, cursor)
+        lo = max(hi - HISTORY_PAGE_SIZE, 0)
+    
+    page = [entries[ids[i]] for i in range(hi - 1, lo - 1, -1)]
+    return page, hi < len(ids), lo > 0
+
+
 def generate_image_url(prompt: str) -> str:
     """Generate image using Pollinations.ai (no API key needed!)"""
     # Clean prompt for URL
     clean_prompt = prompt.replace(' ', '%20')
-    return f"https://image.pollinations.ai/prompt/{clean_prompt}?width=1024&height=1024&nologo=true"
+    # Random seed so regenerating the same prompt yields a new image
+    seed = random.randint(0, 2**31 - 1)
+    return f"https://image.pollinations.ai/prompt/{clean_prompt}?width=1024&height=1024&nologo=true&seed={seed}"
 
 
 def initialize_paystack_transaction(email: str, amount: int, plan: str) -> Dict[str, Any]:
@@ -247,6 +506,7 @@ I help businesses create amazing content in seconds using AI!
 /create - Start creating content
 /upgrade - View pricing plans
 /status - Check your usage
+/history - Revisit past content
 /help - Full guide
 
 Let's create something amazing! 🚀"""
@@ -286,6 +546,11 @@ Example: "Hashtags for fashion boutique"
 Generate custom images
 Example: "Modern minimalist logo for tech startup"
 
+*🗂 History:*
+/history shows everything you've created
+Tap an item to view it again or regenerate it
+Filter by type, e.g. /history ad_copy
+
 *💡 Pro Tips:*
 • Be specific about your target audience
 • Mention tone (professional, casual, funny)
@@ -363,35 +628,10 @@ async def handle_content_type(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
-async def handle_content_request(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Generate content based on user input."""
-    user_id = update.effective_user.id
-    user_input = update.message.text
-    
-    initialize_user(user_id)
-    
-    # Check limits
-    can_generate, remaining = check_usage_limit(user_id)
-    
-    if not can_generate:
-        await update.message.reply_text(
-            f"❌ *Daily Limit Reached*\n\n"
-            f"Upgrade for more:\n/upgrade",
-            parse_mode='Markdown'
-        )
-        return
-    
-    # Get content type from context
-    content_type = context.user_data.get('content_type')
-    
-    if not content_type:
-        await update.message.reply_text(
-            "Please start with /create to choose a content type first!"
-        )
-        return
-    
+async def generate_content(message: Message, user_id: int, content_type: str, user_input: str, remaining: int) -> bool:
+    """Generate content and reply to `message`. Returns True if a new generation was delivered."""
     # Show loading message
-    loading_msg = await update.message.reply_text("⏳ *Generating your content...*", parse_mode='Markdown')
+    loading_msg = await message.reply_text("⏳ *Generating your content...*", parse_mode='Markdown')
     
     try:
         if content_type == 'image':
@@ -399,7 +639,8 @@ async def handle_content_request(update: Update, context: ContextTypes.DEFAULT_T
             image_url = generate_image_url(user_input)
             
             await loading_msg.delete()
-            await update.message.reply_photo(
+            loading_msg = None
+            await message.reply_photo(
                 photo=image_url,
                 caption=f"🎨 *Your AI-Generated Image*\n\n"
                         f"Prompt: {user_input}\n\n"
@@ -407,49 +648,206 @@ async def handle_content_request(update: Update, context: ContextTypes.DEFAULT_T
                         f"/create for more!",
                 parse_mode='Markdown'
             )
+            add_history_entry(user_id, content_type, user_input, image_url)
         else:
             # Generate text content
             system_prompt = SYSTEM_PROMPTS.get(content_type, "")
-            result = call_openrouter(user_input, system_prompt)
+            deadline = time.monotonic() + OPENROUTER_DEADLINE_SECONDS
+            result = await call_openrouter(user_input, system_prompt, deadline=deadline)
             
             if result:
                 await loading_msg.delete()
+                loading_msg = None
                 
-                # Add type emoji
-                type_emoji = {
-                    'social_post': '📱',
-                    'ad_copy': '📢',
-                    'product_desc': '📦',
-                    'hashtags': '#️⃣'
-                }
-                
-                await update.message.reply_text(
-                    f"{type_emoji.get(content_type, '✨')} *Your Content:*\n\n"
+                await message.reply_text(
+                    f"{TYPE_EMOJI.get(content_type, '✨')} *Your Content:*\n\n"
                     f"{result}\n\n"
                     f"━━━━━━━━━━━━━━━\n"
                     f"📊 Remaining today: {remaining - 1}\n"
                     f"/create for more content!",
                     parse_mode='Markdown'
                 )
+                remember_result(user_id, content_type, user_input, result)
+                add_history_entry(user_id, content_type, user_input, result)
             else:
                 await loading_msg.delete()
-                await update.message.reply_text(
+                loading_msg = None
+                
+                # Degraded mode: serve a similar earlier result instead of failing
+                similar = find_similar_result(user_id, content_type, user_input)
+                if similar:
+                    cached_prompt, cached_result = similar
+                    await message.reply_text(
+                        f"⚠️ *AI service is busy — showing a similar earlier result*\n"
+                        f"Generated for: {escape_markdown(cached_prompt)}\n\n"
+                        f"{cached_result}\n\n"
+                        f"━━━━━━━━━━━━━━━\n"
+                        f"This didn't count toward your limit.\n"
+                        f"Send your request again in a moment for fresh content.",
+                        parse_mode='Markdown'
+                    )
+                    return False
+                
+                await message.reply_text(
                     "❌ Sorry, I encountered an error. Please try again in a moment."
                 )
-                return
+                return False
         
         # Increment usage
         increment_usage(user_id)
-        
-        # Clear content type from context
-        context.user_data.pop('content_type', None)
+        return True
         
     except Exception as e:
         logger.error(f"Content generation error: {e}")
-        await loading_msg.delete()
-        await update.message.reply_text(
+        if loading_msg:
+            await loading_msg.delete()
+        await message.reply_text(
             "❌ An error occurred. Please try again!"
         )
+        return False
+
+
+async def handle_content_request(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Generate content based on user input."""
+    user_id = update.effective_user.id
+    user_input = update.message.text
+    
+    initialize_user(user_id)
+    
+    # Check limits
+    can_generate, remaining = check_usage_limit(user_id)
+    
+    if not can_generate:
+        await update.message.reply_text(
+            f"❌ *Daily Limit Reached*\n\n"
+            f"Upgrade for more:\n/upgrade",
+            parse_mode='Markdown'
+        )
+        return
+    
+    # Get content type from context
+    content_type = context.user_data.get('content_type')
+    
+    if not content_type:
+        await update.message.reply_text(
+            "Please start with /create to choose a content type first!"
+        )
+        return
+    
+    if await generate_content(update.message, user_id, content_type, user_input, remaining):
+        # Clear content type from context
+        context.user_data.pop('content_type', None)
+
+
+# ========== GENERATION HISTORY ==========
+def history_keyboard(user_id: int, content_type: str, direction: str = 'o', cursor: Optional[int] = None) -> Optional[InlineKeyboardMarkup]:
+    """Build the inline keyboard for one /history page, or None if empty."""
+    page, has_newer, has_older = get_history_page(user_id, content_type, direction, cursor)
+    
+    if not page:
+        return None
+    
+    keyboard = []
+    for entry in page:
+        label = (
+            f"{TYPE_EMOJI.get(entry['content_type'], '✨')} "
+            f"{entry['created_at']:%b %d %H:%M} · {entry['preview']}"
+        )
+        keyboard.append([InlineKeyboardButton(label, callback_data=f"hist_v_{entry['id']}")])
+    
+    nav = []
+    if has_newer:
+        nav.append(InlineKeyboardButton("⬅️ Newer", callback_data=f"hist_p_{content_type}_n_{page[0]['id']}"))
+    if has_older:
+        nav.append(InlineKeyboardButton("Older ➡️", callback_data=f"hist_p_{content_type}_o_{page[-1]['id']}"))
+    if nav:
+        keyboard.append(nav)
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /history command. Optionally filtered, e.g. /history ad_copy."""
+    user_id = update.effective_user.id
+    initialize_user(user_id)
+    
+    content_type = context.args[0] if context.args else 'all'
+    
+    if content_type != 'all' and content_type not in CONTENT_TYPES.values():
+        await update.message.reply_text(
+            f"Unknown content type. Use one of: {', '.join(CONTENT_TYPES.values())}"
+        )
+        return
+    
+    reply_markup = history_keyboard(user_id, content_type)
+    
+    if not reply_markup:
+        await update.message.reply_text("📭 No saved content yet. Use /create to get started!")
+        return
+    
+    await update.message.reply_text(
+        f"🗂 *Your Content History*\n\n"
+        f"Tap an item to view it again or regenerate it.",
+        reply_markup=reply_markup,
+        parse_mode='Markdown'
+    )
+
+
+async def handle_history_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle history pagination, viewing and regeneration."""
+    query = update.callback_query
+    await query.answer()
+    
+    user_id = update.effective_user.id
+    initialize_user(user_id)
+    
+    parts = query.data.split('_')
+    action = parts[1]
+    
+    if action == 'p':
+        # hist_p_<content_type>_<direction>_<cursor>; content types may contain '_'
+        content_type = '_'.join(parts[2:-2])
+        direction, cursor = parts[-2], int(parts[-1])
+        reply_markup = history_keyboard(user_id, content_type, direction, cursor)
+        if reply_markup:
+            await query.edit_message_reply_markup(reply_markup=reply_markup)
+        return
+    
+    entry = get_history_entry(user_id, int(parts[2]))
+    
+    if not entry:
+        await query.message.reply_text("That item is no longer available.")
+        return
+    
+    if action == 'v':
+        regenerate = InlineKeyboardMarkup([
+            [InlineKeyboardButton("🔄 Regenerate", callback_data=f"hist_r_{entry['id']}")]
+        ])
+        if entry['content_type'] == 'image':
+            await query.message.reply_photo(
+                photo=entry['result'],
+                caption=f"🎨 Prompt: {entry['prompt']}",
+                reply_markup=regenerate
+            )
+        else:
+            await query.message.reply_text(
+                f"{TYPE_EMOJI.get(entry['content_type'], '✨')} *Saved Content:*\n\n"
+                f"{entry['result']}",
+                reply_markup=regenerate,
+                parse_mode='Markdown'
+            )
+    elif action == 'r':
+        can_generate, remaining = check_usage_limit(user_id)
+        
+        if not can_generate:
+            await query.message.reply_text(
+                f"❌ *Daily Limit Reached*\n\n"
+                f"Upgrade for more:\n/upgrade",
+                parse_mode='Markdown'
+            )
+            return
+        
+        await generate_content(query.message, user_id, entry['content_type'], entry['prompt'], remaining)
 
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -677,7 +1075,9 @@ def main() -> None:
     application.add_handler(CommandHandler("status", status))
     application.add_handler(CommandHandler("upgrade", upgrade))
     application.add_handler(CommandHandler("verify", verify_payment))
+    application.add_handler(CommandHandler("history", history))
     application.add_handler(CallbackQueryHandler(handle_content_type, pattern="^type_"))
+    application.add_handler(CallbackQueryHandler(handle_history_callback, pattern="^hist_"))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_content_request))
     
     # Start the bot